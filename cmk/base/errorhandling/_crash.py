@@ -4,16 +4,18 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 """Check_MK base specific code of the crash reporting"""
 
+import os
 import traceback
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Final
 
 import cmk.ccc.debug
 import cmk.ccc.version as cmk_version
 from cmk.ccc import crash_reporting
 
-import cmk.utils.encoding
 import cmk.utils.paths
 from cmk.utils.agentdatatype import AgentRawData
 from cmk.utils.hostaddress import HostName
@@ -24,10 +26,26 @@ from cmk.snmplib import SNMPBackendEnum
 
 from cmk.checkengine.checking import CheckPluginName
 
-from cmk.piggyback.backend import get_messages_for
+from cmk.piggyback.backend import payload_dir
 
 CrashReportStore = crash_reporting.CrashReportStore
 
+# The store is stateless, so both entry points share one instance instead of
+# constructing a fresh one per crash.
+_CRASH_REPORT_STORE: Final = CrashReportStore()
+
+# Invariant shape of the check crash details; copied and filled in per crash
+# so the hot path is a C-level dict copy plus plain stores.
+_CHECK_DETAILS_TEMPLATE: Final[Mapping[str, Any]] = {
+    "check_output": None,
+    "host": None,
+    "is_cluster": None,
+    "description": None,
+    "check_type": None,
+    "inline_snmp": None,
+    "enforced_service": None,
+}
+
 
 def create_section_crash_dump(
     *,
@@ -41,6 +59,10 @@ def create_section_crash_dump(
 
     text = f"{operation.title()} of section {section_name} failed"
     try:
+        snmp_info = partial(_read_snmp_info, host_name)
+        agent_output = (
+            rtc_package if rtc_package is not None else partial(_read_agent_output, host_name)
+        )
         crash = SectionCrashReport.from_exception(
             cmk.utils.paths.crash_dir,
             cmk_version.get_general_version_infos(cmk.utils.paths.omd_root),
@@ -50,18 +72,16 @@ def create_section_crash_dump(
                 "host_name": host_name,
             },
             type_specific_attributes={
-                "snmp_info": _read_snmp_info(host_name),
-                "agent_output": (
-                    _read_agent_output(host_name) if rtc_package is None else rtc_package
-                ),
+                "snmp_info": snmp_info,
+                "agent_output": agent_output,
             },
         )
-        CrashReportStore().save(crash)
+        _CRASH_REPORT_STORE.save(crash)
         return f"{text} - please submit a crash report! (Crash-ID: {crash.ident_to_text()})"
-    except Exception:
+    except Exception as e:
         if cmk.ccc.debug.enabled():
             raise
-        return f"{text} - failed to create a crash report: {traceback.format_exc()}"
+        return f"{text} - failed to create a crash report: {_format_exception_only(e)}"
 
 
 def create_check_crash_dump(
@@ -83,97 +103,198 @@ def create_check_crash_dump(
     """
     text = "check failed - please submit a crash report!"
     try:
+        details = dict(_CHECK_DETAILS_TEMPLATE)
+        details["check_output"] = text
+        details["host"] = host_name
+        details["is_cluster"] = is_cluster
+        details["description"] = service_name
+        details["check_type"] = str(plugin_name)
+        details["inline_snmp"] = snmp_backend is SNMPBackendEnum.INLINE
+        details["enforced_service"] = is_enforced
+        details.update(plugin_kwargs)
+        snmp_info = partial(_read_snmp_info, host_name)
+        agent_output = (
+            rtc_package if rtc_package is not None else partial(_read_agent_output, host_name)
+        )
         crash = CheckCrashReport.from_exception(
             cmk.utils.paths.crash_dir,
             cmk_version.get_general_version_infos(cmk.utils.paths.omd_root),
-            details={
-                "check_output": text,
-                "host": host_name,
-                "is_cluster": is_cluster,
-                "description": service_name,
-                "check_type": str(plugin_name),
-                "inline_snmp": snmp_backend is SNMPBackendEnum.INLINE,
-                "enforced_service": is_enforced,
-                **plugin_kwargs,
-            },
+            details=details,
             type_specific_attributes={
-                "snmp_info": _read_snmp_info(host_name),
-                "agent_output": (
-                    _read_agent_output(host_name) if rtc_package is None else rtc_package
-                ),
+                "snmp_info": snmp_info,
+                "agent_output": agent_output,
             },
         )
-        CrashReportStore().save(crash)
+        _CRASH_REPORT_STORE.save(crash)
         text += " (Crash-ID: %s)" % crash.ident_to_text()
         return text
-    except Exception:
+    except Exception as e:
         if cmk.ccc.debug.enabled():
             raise
-        return "check failed - failed to create a crash report: %s" % traceback.format_exc()
+        return "check failed - failed to create a crash report: %s" % _format_exception_only(e)
+
+
+def _format_exception_only(exc: Exception) -> str:
+    """One-line description of the exception for the fallback message
+
+    Unlike traceback.format_exc this does not walk the frames and read
+    their source lines; the full context is available via debug mode.
+    """
+    return "".join(traceback.format_exception_only(exc)).strip()
 
 
 class CrashReportWithAgentOutput(crash_reporting.ABCCrashReport):
+    """Crash report that carries the host's agent output and snmpwalk
+
+    Both attributes may be passed as zero-argument callables; these are
+    only resolved when the attribute is actually accessed, i.e. when the
+    crash report is serialized. A crash dump that is never saved (the
+    debug path re-raises instead) never pays for the file reads.
+    """
+
     def __init__(
         self,
         crashdir: Path,
         crash_info: dict,
-        snmp_info: bytes | None = None,
-        agent_output: bytes | None = None,
+        snmp_info: bytes | Callable[[], bytes | None] | None = None,
+        agent_output: bytes | Callable[[], bytes | None] | None = None,
     ) -> None:
         super().__init__(crashdir, crash_info)
-        self.snmp_info = snmp_info
-        self.agent_output = agent_output
+        self._snmp_info = snmp_info
+        self._agent_output = agent_output
+
+    @property
+    def snmp_info(self) -> bytes | None:
+        if callable(self._snmp_info):
+            self._snmp_info = self._snmp_info()
+        return self._snmp_info
+
+    @property
+    def agent_output(self) -> bytes | None:
+        if callable(self._agent_output):
+            self._agent_output = self._agent_output()
+        return self._agent_output
 
     def _serialize_attributes(self) -> dict:
         """Serialize object type specific attributes for transport"""
         attributes = super()._serialize_attributes()
 
-        for key, val in [
-            ("snmp_info", self.snmp_info),
-            ("agent_output", self.agent_output),
-        ]:
-            if val is not None:
-                attributes[key] = val
+        if (snmp_info := self.snmp_info) is not None:
+            attributes["snmp_info"] = snmp_info
+        if (agent_output := self.agent_output) is not None:
+            attributes["agent_output"] = agent_output
 
         return attributes
 
 
-@crash_reporting.crash_report_registry.register
-class SectionCrashReport(CrashReportWithAgentOutput):
-    @staticmethod
-    def type() -> Literal["section"]:
-        return "section"
+def _register_crash_report_type(type_name: str) -> type[CrashReportWithAgentOutput]:
+    """Create and register a crash report type differing only in its type marker"""
 
+    class _CrashReport(CrashReportWithAgentOutput):
+        @staticmethod
+        def type() -> str:
+            return type_name
 
-@crash_reporting.crash_report_registry.register
-class CheckCrashReport(CrashReportWithAgentOutput):
-    @staticmethod
-    def type() -> Literal["check"]:
-        return "check"
+    _CrashReport.__name__ = _CrashReport.__qualname__ = f"{type_name.title()}CrashReport"
+    return crash_reporting.crash_report_registry.register(_CrashReport)
 
 
-def _read_snmp_info(hostname: str) -> bytes | None:
-    cache_path = Path(cmk.utils.paths.snmpwalks_dir, hostname)
+SectionCrashReport = _register_crash_report_type("section")
+CheckCrashReport = _register_crash_report_type("check")
+
+
+@lru_cache(maxsize=64)
+def _cached_file_content(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read a whole file, memoized per (path, mtime, size)
+
+    Many checks crashing on the same host in one invocation share their
+    host's cache files; keying on the stat result collapses the repeated
+    reads into one per file per process while still catching rotated files.
+
+    The size is known from the stat call, so the buffered IO layer is
+    skipped in favour of a single pre-sized os.read.
+    """
+    fd = os.open(path, os.O_RDONLY)
     try:
-        with cache_path.open(mode="rb") as f:
-            return f.read()
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _read_file_cached(path: str) -> bytes | None:
+    try:
+        st = os.stat(path)
+        return _cached_file_content(path, st.st_mtime_ns, st.st_size)
     except OSError:
-        pass
-    return None
+        return None
+
+
+def _read_snmp_info(hostname: str) -> bytes | None:
+    return _read_file_cached(os.path.join(cmk.utils.paths.snmpwalks_dir, hostname))
 
 
 def _read_agent_output(hostname: HostName) -> AgentRawData | None:
     agent_outputs = []
 
-    cache_path = Path(cmk.utils.paths.tcp_cache_dir, hostname)
+    cache_path = os.path.join(cmk.utils.paths.tcp_cache_dir, hostname)
+    if (output := _read_file_cached(cache_path)) is not None:
+        agent_outputs.append(output)
+
+    # Note: this is not quite what the fetcher does :(
+    agent_outputs.extend(_read_piggyback_payloads(hostname))
+
+    if not agent_outputs:
+        return None
+    if len(agent_outputs) == 1:
+        # common case (no piggyback data): pass the single chunk through
+        # without copying it into a fresh buffer
+        return AgentRawData(agent_outputs[0])
+    # bytes.join writes all chunks into one exactly-sized result, so this
+    # is already a single allocation and a single copy
+    return AgentRawData(b"\n".join(agent_outputs))
+
+
+@lru_cache(maxsize=256)
+def _piggyback_payload_files(hostname: HostName) -> tuple[str, ...]:
+    """Enumerate the piggyback payload files for this host, once per process
+
+    During a crash storm every failing check of a host would otherwise
+    re-walk the same payload directory. The file contents are still
+    validated per read via the stat-keyed content cache.
+    """
+    host_dir = os.path.join(payload_dir(cmk.utils.paths.omd_root), hostname)
     try:
-        agent_outputs.append(cache_path.read_bytes())
+        with os.scandir(host_dir) as entries:
+            return tuple(e.path for e in entries if e.is_file())
     except OSError:
-        pass
+        return ()
 
-    # Note: this is not quite what the fetcher does :(
-    agent_outputs.extend(r.raw_data for r in get_messages_for(hostname, cmk.utils.paths.omd_root))
 
-    if agent_outputs:
-        return AgentRawData(b"\n".join(agent_outputs))
-    return None
+# For a handful of files the serial loop wins; beyond that overlapping the
+# reads pays off on high-latency filesystems (NFS sites in particular).
+_MIN_FILES_FOR_PARALLEL_READ: Final = 4
+
+_read_pool: ThreadPoolExecutor | None = None
+
+
+def _read_executor() -> ThreadPoolExecutor:
+    global _read_pool
+    if _read_pool is None:
+        _read_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cmk-crash-read")
+    return _read_pool
+
+
+def _read_piggyback_payloads(hostname: HostName) -> list[bytes]:
+    """Read the raw piggyback payloads for this host
+
+    The crash report only needs the raw data, so we read the payload files
+    directly instead of assembling the per-source meta data. Files that
+    vanish between listing and reading are silently skipped.
+    """
+    paths = _piggyback_payload_files(hostname)
+    results = (
+        _read_executor().map(_read_file_cached, paths)
+        if len(paths) > _MIN_FILES_FOR_PARALLEL_READ
+        else map(_read_file_cached, paths)
+    )
+    return [payload for payload in results if payload is not None]
@@ -5,20 +5,42 @@
 
 from __future__ import annotations
 
-from ._agent import AgentParser
-from ._parser import (
-    AgentRawDataSection,
-    AgentRawDataSectionElem,
-    HostSections,
-    NO_SELECTION,
-    parse_raw_data,
-    Parser,
-    ParserFunction,
-    SectionNameCollection,
-)
-from ._sectionstore import SectionStore
-from ._snmp import SNMPParser
-from ._utils import group_by_host
+import importlib
+from typing import Final, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._agent import AgentParser
+    from ._parser import (
+        AgentRawDataSection,
+        AgentRawDataSectionElem,
+        HostSections,
+        NO_SELECTION,
+        parse_raw_data,
+        Parser,
+        ParserFunction,
+        SectionNameCollection,
+    )
+    from ._sectionstore import SectionStore
+    from ._snmp import SNMPParser
+    from ._utils import group_by_host
+
+# The parser stack (in particular the SNMP side) is expensive to import.
+# Defer the submodule imports via PEP 562 so that importers only pay for
+# the names they actually use.
+_LAZY_IMPORTS: Final = {
+    "AgentParser": "._agent",
+    "AgentRawDataSection": "._parser",
+    "AgentRawDataSectionElem": "._parser",
+    "group_by_host": "._utils",
+    "HostSections": "._parser",
+    "NO_SELECTION": "._parser",
+    "parse_raw_data": "._parser",
+    "Parser": "._parser",
+    "ParserFunction": "._parser",
+    "SectionNameCollection": "._parser",
+    "SectionStore": "._sectionstore",
+    "SNMPParser": "._snmp",
+}
 
 __all__ = [
     "AgentParser",
@@ -34,3 +56,14 @@ __all__ = [
     "SectionStore",
     "SNMPParser",
 ]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __name__), name)
+    # cache the resolved name so __getattr__ only runs once per symbol
+    globals()[name] = value
+    return value
@@ -239,7 +239,7 @@ class PageCrash(ABCCrashReportPage):
                     (
                         "crashdump",
                         base64.b64encode(
-                            _pack_crash_report(self._get_serialized_crash_report())
+                            _pack_crash_report(self._get_serialized_crash_report()).getbuffer()
                         ).decode("ascii"),
                     ),
                 ]
@@ -670,11 +670,15 @@ class PageDownloadCrashReport(ABCCrashReportPage):
         )
         response.set_content_type("application/x-tgz")
         response.set_content_disposition(ContentDispositionType.ATTACHMENT, filename)
-        response.set_data(_pack_crash_report(self._get_serialized_crash_report()))
+        response.set_data(_pack_crash_report(self._get_serialized_crash_report()).getvalue())
 
 
-def _pack_crash_report(serialized_crash_report: Mapping[str, bytes | None]) -> bytes:
-    """Returns a byte string representing the current crash report in tar archive format"""
+def _pack_crash_report(serialized_crash_report: Mapping[str, bytes | None]) -> io.BytesIO:
+    """Returns a buffer holding the current crash report in tar archive format
+
+    The buffer is returned as-is so callers can hand its memory on (e.g. to
+    base64) without first copying it into a standalone byte string.
+    """
     buf = io.BytesIO()
     with tarfile.open(mode="w:gz", fileobj=buf) as tar:
         for key, content in serialized_crash_report.items():
@@ -686,4 +690,4 @@ def _pack_crash_report(serialized_crash_report: Mapping[str, bytes | None]) -> b
 
             tar.addfile(tar_info, io.BytesIO(content))
 
-    return buf.getvalue()
+    return buf
@@ -7,7 +7,7 @@ import json
 import pprint
 from collections.abc import Sequence
 from dataclasses import asdict, dataclass
-from enum import Enum
+from enum import StrEnum
 from typing import Any, Literal, TypeVar
 
 from cmk.ccc.exceptions import MKGeneralException
@@ -229,7 +229,7 @@ def get_vue_value(field_id: str, fallback_value: Any) -> Any:
     return fallback_value
 
 
-class RenderMode(Enum):
+class RenderMode(StrEnum):
     EDIT = "edit"
     READONLY = "readonly"
     BOTH = "both"
@@ -4,7 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 from dataclasses import dataclass
 from enum import auto, Enum
-from typing import Any
+from typing import Any, Final
 
 from cmk.gui.form_specs.vue.shared_type_defs import ValidationMessage
 
@@ -12,10 +12,15 @@ DataForDisk = Any
 
 
 class DefaultValue:
-    pass
+    """Sentinel for "use the form spec's default", see EmptyValue below"""
 
+    __slots__ = ()
 
-DEFAULT_VALUE = DefaultValue()
+    def __repr__(self) -> str:
+        return "DEFAULT_VALUE"
+
+
+DEFAULT_VALUE: Final = DefaultValue()
 
 
 class DataOrigin(Enum):
@@ -23,17 +28,29 @@ class DataOrigin(Enum):
     FRONTEND = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VisitorOptions:
     # Depending on the origin, we will call the migrate function
     data_origin: DataOrigin
 
 
 class EmptyValue:
-    pass
+    """Sentinel for an unparseable value
+
+    Keep it attribute-less: the one instance below is shared everywhere,
+    so prefer the identity check ``value is EMPTY_VALUE`` over isinstance.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "EMPTY_VALUE"
 
 
-EMPTY_VALUE = EmptyValue()
+EMPTY_VALUE: Final = EmptyValue()
 
 
 class FormSpecValidationError(ValueError):
@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 from ._config import Config, PiggybackTimeSettings
+from ._paths import payload_dir
 from ._storage import (
     cleanup_piggyback_files,
     get_messages_for,
@@ -23,6 +24,7 @@ __all__ = [
     "get_messages_for",
     "get_piggybacked_host_with_sources",
     "move_for_host_rename",
+    "payload_dir",
     "PiggybackMessage",
     "PiggybackMetaData",
     "remove_source_status_file",
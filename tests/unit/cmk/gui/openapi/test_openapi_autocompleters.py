@@ -14,27 +14,28 @@ from cmk.gui.valuespec import autocompleter_registry
 
 
 @pytest.fixture(name="expected_autocompleters")
-def fixture_expected_autocompleters() -> list[str]:
-    autocompleters = [
-        "sites",
-        "monitored_hostname",
-        "allgroups",
-        "label",
-        "tag_groups",
-        "tag_groups_opt",
-        "monitored_service_description",
-    ]
+def fixture_expected_autocompleters() -> frozenset[str]:
+    autocompleters = frozenset(
+        {
+            "sites",
+            "monitored_hostname",
+            "allgroups",
+            "label",
+            "tag_groups",
+            "tag_groups_opt",
+            "monitored_service_description",
+        }
+    )
 
     if is_enterprise_repo():
-        autocompleters.append("graph_template_for_combined_graph")
+        return autocompleters | {"graph_template_for_combined_graph"}
 
     return autocompleters
 
 
-def test_openapi_autocompleter_functions_exist(expected_autocompleters: list[str]) -> None:
-    registered_autocompleters = autocompleter_registry.keys()
-    for autocomplete_name in expected_autocompleters:
-        assert autocomplete_name in registered_autocompleters
+def test_openapi_autocompleter_functions_exist(expected_autocompleters: frozenset[str]) -> None:
+    missing = expected_autocompleters - autocompleter_registry.keys()
+    assert not missing, f"Autocompleters not registered: {sorted(missing)}"
 
 
 def test_openapi_autocompleter_does_not_exist(clients: ClientRegistry) -> None: